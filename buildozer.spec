@@ -15,7 +15,7 @@ source.exclude_patterns = license,images/*/*.jpg
 version = 1.0
 
 # Application requirements
-requirements = python3,kivy,kivymd,requests,beautifulsoup4,feedparser,textstat,lxml,certifi,charset_normalizer,idna,urllib3,soupsieve,typing_extensions,pyphen,cmudict,setuptools
+requirements = python3,kivy,kivymd,requests,beautifulsoup4,feedparser,lxml,certifi,charset_normalizer,idna,urllib3,soupsieve,typing_extensions,setuptools
 
 # Android specific
 [android]
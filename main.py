@@ -9,8 +9,13 @@ from kivy.uix.popup import Popup
 from kivy.clock import Clock
 from kivy.utils import platform
 import threading
+import os
 from mobile_agent import MobileNewsAgent
 
+def _ellip(s, n=80):
+    """Truncate s to n characters, marking the cut with a single ellipsis glyph"""
+    return s if len(s) <= n else s[:n] + '…'
+
 class ArticleCard(BoxLayout):
     """Widget for displaying a single article"""
     
@@ -40,7 +45,7 @@ class ArticleCard(BoxLayout):
         
         # Title
         title_label = Label(
-            text=article_data['title'][:80] + "..." if len(article_data['title']) > 80 else article_data['title'],
+            text=_ellip(article_data['title'], 80),
             size_hint_y=None,
             height='30dp',
             text_size=(None, None),
@@ -86,7 +91,10 @@ class NewsAgentApp(App):
     
     def build(self):
         self.title = "📰 News Agent"
-        self.agent = MobileNewsAgent(callback=self.agent_callback)
+        self.agent = MobileNewsAgent(
+            callback=self.agent_callback,
+            feed_cache_path=os.path.join(self.user_data_dir, 'feed_cache.json')
+        )
         
         # Main layout
         main_layout = BoxLayout(orientation='vertical', padding='10dp', spacing='10dp')
@@ -1,22 +1,138 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
 from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
 import logging
-import time
-import random
-from typing import List, Dict, Any
+import zlib
+from typing import List, Dict, Any, Optional, Tuple
 import json
 import re
-import textstat
 import threading
+import os
+from collections import defaultdict
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Patterns compiled once and reused for every article; keyword patterns
+# run against the lowercased text cached on each article
+_WS = re.compile(r'\s+')
+_TECH_RE = re.compile(
+    r'\b(?:ai|artificial intelligence|machine learning|technology|software|'
+    r'computer|digital|tech|innovation|startup)\b'
+)
+_RELEVANCE_RE = re.compile(r'\b(?:breaking|urgent|major|significant|important)\b')
+_VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+
+def _flesch_reading_ease(text):
+    """Flesch reading ease with vowel-group syllable counting (no textstat/pyphen needed)"""
+    words = text.split()
+    if not words:
+        return 0.0
+    sentences = max(1, text.count('.') + text.count('!') + text.count('?'))
+    syllables = sum(max(1, len(_VOWEL_GROUPS.findall(word))) for word in text.lower().split())
+    return 206.835 - 1.015 * (len(words) / sentences) - 84.6 * (syllables / len(words))
+
+# Prefer lxml's C parser in streaming (target) mode; fall back to BeautifulSoup
+# if lxml isn't available on the device
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+class CappedRetry(Retry):
+    """Retry that honours Retry-After only up to MAX_RETRY_AFTER seconds, so a
+    server asking for minutes (or hours) can't park a worker thread"""
+    
+    MAX_RETRY_AFTER = 5
+    
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return min(retry_after, self.MAX_RETRY_AFTER)
+
+class ArticleTextTarget:
+    """
+    lxml parser target that keeps only the text inside article containers,
+    so no tree is built for navigation, ads, scripts or footers
+    """
+    
+    # Matchers in priority order, mirroring MobileNewsAgent.CONTENT_SELECTORS,
+    # followed by the <p> fallback
+    MATCHERS = [
+        lambda tag, attrib: tag == 'article',
+        lambda tag, attrib: attrib.get('role') == 'main',
+        lambda tag, attrib: 'article-body' in attrib.get('class', '').split(),
+        lambda tag, attrib: 'story-body' in attrib.get('class', '').split(),
+        lambda tag, attrib: 'entry-content' in attrib.get('class', '').split(),
+        lambda tag, attrib: tag == 'main',
+        lambda tag, attrib: tag == 'p',
+    ]
+    
+    SKIP_TAGS = ('script', 'style')
+    
+    def __init__(self):
+        self.skip = 0  # Nesting depth inside script/style
+        self.depth = [0] * len(self.MATCHERS)
+        self.matched = [False] * len(self.MATCHERS)
+        self.chunks = [[] for _ in self.MATCHERS]
+        
+    def start(self, tag, attrib):
+        if tag in self.SKIP_TAGS:
+            self.skip += 1
+        for i, matches in enumerate(self.MATCHERS):
+            if self.depth[i]:
+                self.depth[i] += 1
+            elif matches(tag, attrib):
+                self.depth[i] = 1
+                self.matched[i] = True
+                
+    def end(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip -= 1
+        for i in range(len(self.MATCHERS)):
+            if self.depth[i]:
+                self.depth[i] -= 1
+                if not self.depth[i]:
+                    self.chunks[i].append(' ')
+                    
+    def data(self, data):
+        if self.skip:
+            return
+        for i in range(len(self.MATCHERS)):
+            if self.depth[i]:
+                self.chunks[i].append(data)
+                
+    def close(self):
+        # First container that matched wins; fall back to paragraphs if it had no text
+        for i in range(len(self.MATCHERS) - 1):
+            if self.matched[i]:
+                content = ''.join(self.chunks[i]).strip()
+                if content:
+                    return content
+                break
+        return ''.join(self.chunks[-1])
 
 class MobileNewsAgent:
     """
     Mobile-optimized news aggregation agent for Android
     """
     
-    def __init__(self, callback=None):
+    # Article body selectors in priority order
+    CONTENT_SELECTORS = [
+        'article', '[role="main"]', '.article-body',
+        '.story-body', '.entry-content', 'main'
+    ]
+    CONTENT_SELECTOR = ', '.join(CONTENT_SELECTORS)
+    
+    MAX_PAGE_BYTES = 256 * 1024  # Plenty of HTML to reach 1500 chars of body text
+    MAX_CONTENT_LENGTH = 2_000_000  # Skip pages advertising more than this
+    MAX_PER_HOST = 2
+    
+    def __init__(self, callback=None, feed_cache_path='feed_cache.json'):
         self.setup_logging()
         self.news_sources = [
             "http://feeds.bbci.co.uk/news/rss.xml",
@@ -29,8 +145,51 @@ class MobileNewsAgent:
         self.session.headers.update({
             'User-Agent': 'NewsAgent-Mobile/1.0'
         })
+        # Reuse TCP/TLS connections across the fetch threads and across runs;
+        # keep pools for up to 16 hosts so repeat refreshes skip the handshakes
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=5,
+            # Retry flaky mobile connections and rate-limited/overloaded servers,
+            # honouring (capped) Retry-After; the last response is returned, not raised
+            max_retries=CappedRetry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.callback = callback  # For UI updates
         self.is_running = False
+        # At most MAX_PER_HOST concurrent requests to any one publisher, shared by
+        # every run of this agent so back-to-back refreshes don't pile onto a host
+        self.host_slots = defaultdict(lambda: threading.Semaphore(self.MAX_PER_HOST))
+        self.host_slots_lock = threading.Lock()
+        # ETag/Last-Modified validators and entries per feed, for conditional GETs
+        self.feed_cache_path = feed_cache_path
+        self.feed_cache = self.load_feed_cache()
+        
+    def load_feed_cache(self) -> Dict[str, Any]:
+        """Load cached feed validators from disk, starting empty if unreadable"""
+        if not os.path.exists(self.feed_cache_path):
+            return {}
+        try:
+            with open(self.feed_cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ignoring unreadable feed cache: {e}")
+            return {}
+            
+    def save_feed_cache(self):
+        """Persist feed validators so the next refresh can send conditional GETs"""
+        try:
+            with open(self.feed_cache_path, 'w', encoding='utf-8') as f:
+                json.dump(self.feed_cache, f)
+        except OSError as e:
+            self.logger.error(f"Failed to save feed cache: {e}")
         
     def setup_logging(self):
         """Configure logging for mobile"""
@@ -70,6 +229,46 @@ class MobileNewsAgent:
             
         return plan
         
+    def _raise_for_status(self, response):
+        """Raise for HTTP errors left after retries, noting any Retry-After hint"""
+        if response.status_code >= 400 and response.headers.get('Retry-After'):
+            self.logger.warning(
+                f"{response.url} still returned {response.status_code} after retries "
+                f"(Retry-After: {response.headers['Retry-After']})"
+            )
+        response.raise_for_status()
+        
+    def _fetch_one(self, source_url: str, cached: Dict[str, Any]):
+        """Download and parse a single RSS feed, returning (url, cache_entry_or_exception)"""
+        try:
+            headers = {}
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('modified'):
+                headers['If-Modified-Since'] = cached['modified']
+                
+            response = self.session.get(source_url, timeout=8, headers=headers)
+            if response.status_code == 304 and 'entries' in cached:
+                return source_url, cached  # Feed unchanged, reuse cached entries
+            self._raise_for_status(response)
+            
+            # Parsed here on the worker thread, overlapping the other feeds' downloads
+            feed = feedparser.parse(response.content)
+            entries = [{
+                'title': entry.get('title', 'No title'),
+                'link': entry.get('link', ''),
+                'published': entry.get('published', ''),
+                'summary': entry.get('summary', '')
+            } for entry in feed.entries[:5]]
+            
+            return source_url, {
+                'etag': response.headers.get('ETag'),
+                'modified': response.headers.get('Last-Modified'),
+                'entries': entries
+            }
+        except Exception as e:
+            return source_url, e
+        
     def fetch_news_feeds(self) -> Dict[str, Any]:
         """Fetch news from RSS feeds"""
         self.update_status("📡 Fetching news feeds...")
@@ -77,17 +276,29 @@ class MobileNewsAgent:
         all_articles = []
         successful_sources = 0
         
-        for i, source_url in enumerate(self.news_sources):
-            try:
+        # All feeds are requested at once; results are collected on this thread
+        with ThreadPoolExecutor(max_workers=max(1, len(self.news_sources))) as executor:
+            futures = [
+                executor.submit(self._fetch_one, url, self.feed_cache.get(url, {}))
+                for url in self.news_sources
+            ]
+            
+            for i, future in enumerate(as_completed(futures)):
+                source_url, result = future.result()
                 self.update_status(f"📰 Source {i+1}/{len(self.news_sources)}")
-                feed = feedparser.parse(source_url)
                 
-                for entry in feed.entries[:5]:
+                if isinstance(result, Exception):
+                    self.logger.error(f"Failed to fetch from {source_url}: {result}")
+                    continue
+                
+                self.feed_cache[source_url] = result
+                
+                for entry in result['entries']:
                     article = {
-                        'title': entry.get('title', 'No title'),
-                        'link': entry.get('link', ''),
-                        'published': entry.get('published', ''),
-                        'summary': entry.get('summary', ''),
+                        'title': entry['title'],
+                        'link': entry['link'],
+                        'published': entry['published'],
+                        'summary': entry['summary'],
                         'source': source_url,
                         'content': '',
                         'word_count': 0,
@@ -99,9 +310,7 @@ class MobileNewsAgent:
                     
                 successful_sources += 1
                 
-            except Exception as e:
-                self.logger.error(f"Failed to fetch from {source_url}: {e}")
-                
+        self.save_feed_cache()
         self.articles = all_articles
         
         return {
@@ -109,69 +318,117 @@ class MobileNewsAgent:
             'successful_sources': successful_sources
         }
         
+    def _fetch_page(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Download the start of a page; the 1500-char excerpt never needs the rest.
+        Returns the body with the charset declared in Content-Type, if any
+        """
+        with self.host_slots_lock:
+            host_slot = self.host_slots[urlparse(url).netloc]
+            
+        with host_slot:
+            response = self.session.get(url, timeout=8, stream=True)
+            try:
+                self._raise_for_status(response)
+                if int(response.headers.get('Content-Length') or 0) > self.MAX_CONTENT_LENGTH:
+                    raise ValueError(f"Page too large ({response.headers['Content-Length']} bytes)")
+                # Without an explicit charset, requests guesses ISO-8859-1 for text/html;
+                # leave it to the parser to sniff <meta charset> instead
+                encoding = None
+                if 'charset' in response.headers.get('Content-Type', '').lower():
+                    encoding = response.encoding
+                return response.raw.read(self.MAX_PAGE_BYTES, decode_content=True), encoding
+            finally:
+                response.close()
+        
+    def _extract_text(self, html: bytes, encoding: Optional[str] = None) -> str:
+        """Pull the article body text out of a page"""
+        content = ""
+        
+        if HAS_LXML:
+            try:
+                parser = etree.HTMLParser(target=ArticleTextTarget(), encoding=encoding)
+            except LookupError:
+                # Unknown charset in the header; let lxml sniff the document
+                parser = etree.HTMLParser(target=ArticleTextTarget())
+            return etree.fromstring(html, parser)
+            
+        soup = BeautifulSoup(html, 'html.parser', from_encoding=encoding)
+        # One tree walk for all selectors, then keep the highest-priority one that matched
+        matches = soup.select(self.CONTENT_SELECTOR)
+        for selector in self.CONTENT_SELECTORS:
+            elements = [elem for elem in matches if elem.css.match(selector)]
+            if elements:
+                content = ' '.join(elem.get_text(' ', strip=True) for elem in elements)
+                break
+        if not content:
+            content = ' '.join(p.get_text(' ', strip=True) for p in soup.find_all('p'))
+        return content
+        
     def extract_article_content(self) -> Dict[str, Any]:
         """Extract content from top articles only (mobile optimization)"""
         self.update_status("📄 Extracting article content...")
         
         extracted_count = 0
         # Limit to top 5 articles for mobile performance
-        for i, article in enumerate(self.articles[:5]):
-            try:
-                if article['link']:
-                    self.update_status(f"📖 Reading article {i+1}/5")
-                    response = self.session.get(article['link'], timeout=8)
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Extract content
-                    content_selectors = [
-                        'article', '[role="main"]', '.article-body', 
-                        '.story-body', '.entry-content', 'main'
-                    ]
-                    
-                    content = ""
-                    for selector in content_selectors:
-                        elements = soup.select(selector)
-                        if elements:
-                            content = ' '.join([elem.get_text() for elem in elements])
-                            break
-                    
-                    if not content:
-                        paragraphs = soup.find_all('p')
-                        content = ' '.join([p.get_text() for p in paragraphs])
-                    
-                    content = re.sub(r'\s+', ' ', content).strip()
+        targets = [a for a in self.articles[:5] if a['link']]
+        
+        # Download concurrently, parse on this thread as responses arrive
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = {
+                executor.submit(self._fetch_page, article['link']): article
+                for article in targets
+            }
+            
+            for i, future in enumerate(as_completed(futures)):
+                article = futures[future]
+                try:
+                    self.update_status(f"📖 Reading article {i+1}/{len(targets)}")
+                    content = self._extract_text(*future.result())
+                    content = _WS.sub(' ', content).strip()
                     article['content'] = content[:1500]  # Limit for mobile
                     article['word_count'] = len(content.split())
                     
                     extracted_count += 1
-                    time.sleep(1)  # Rate limiting
                     
-            except Exception as e:
-                self.logger.error(f"Failed to extract content: {e}")
+                except Exception as e:
+                    self.logger.error(f"Failed to extract content: {e}")
+                    
+        for article in self.articles:
+            self._cache_lowercase(article)
                 
         return {'extracted_articles': extracted_count}
         
+    def _cache_lowercase(self, article):
+        """Store lowercased title and full text on the article for keyword matching"""
+        article['_lc_title'] = article['title'].lower()
+        article['_lc_all'] = f"{article['title']} {article['summary']} {article['content']}".lower()
+        
     def analyze_content_quality(self) -> Dict[str, Any]:
         """Analyze content quality"""
         self.update_status("🔍 Analyzing content quality...")
         
+        analyzed_count = 0
+        
+        # One pass computes every per-article metric
         for article in self.articles:
-            if article['content']:
-                try:
-                    article['readability_score'] = textstat.flesch_reading_ease(article['content'])
-                except:
-                    article['readability_score'] = 50  # Default
+            content = article['content']
+            if not content:
+                continue
                 
-                # Quality scoring
-                quality_score = 0
-                if article['word_count'] > 100: quality_score += 20
-                if article['word_count'] > 300: quality_score += 20
-                if len(article['title']) > 10: quality_score += 10
-                if article['summary']: quality_score += 10
-                
-                article['quality_score'] = quality_score
+            analyzed_count += 1
+            article['readability_score'] = _flesch_reading_ease(content)
+            
+            # Quality scoring, as one branch-free sum of the indicator flags
+            word_count = article['word_count']
+            article['quality_score'] = (
+                20 * (word_count > 100) +
+                20 * (word_count > 300) +
+                10 * (len(article['title']) > 10) +
+                10 * bool(article['summary'])
+            )
                 
-        return {'analyzed_articles': len([a for a in self.articles if a['content']])}
+        return {'analyzed_articles': analyzed_count}
         
     def summarize_articles(self) -> Dict[str, Any]:
         """Generate summaries using simple text processing"""
@@ -182,7 +439,8 @@ class MobileNewsAgent:
         for article in self.articles:
             if article['content'] and len(article['content']) > 100:
                 try:
-                    sentences = article['content'].split('. ')
+                    # maxsplit=2 stops after the first two sentences instead of splitting the whole text
+                    sentences = article['content'].split('. ', 2)
                     summary_sentences = sentences[:2]  # Shorter for mobile
                     article['ai_summary'] = '. '.join(summary_sentences)[:150] + "..."
                     summarized_count += 1
@@ -197,12 +455,15 @@ class MobileNewsAgent:
         """Rank articles by relevance"""
         self.update_status("📊 Ranking articles...")
         
+        # relevance_score stays on each article dict: the UI cards read it there,
+        # and a parallel column would not make the keyed sort any cheaper
         for article in self.articles:
             relevance_score = 0
             
             # Title relevance
-            title_keywords = ['breaking', 'urgent', 'major', 'significant', 'important']
-            if any(keyword in article['title'].lower() for keyword in title_keywords):
+            if '_lc_title' not in article:  # Content extraction was skipped
+                self._cache_lowercase(article)
+            if _RELEVANCE_RE.search(article['_lc_title']):
                 relevance_score += 20
                 
             relevance_score += article.get('quality_score', 0)
@@ -210,7 +471,8 @@ class MobileNewsAgent:
             if article.get('readability_score', 0) > 60:
                 relevance_score += 10
                 
-            relevance_score += random.randint(0, 10)
+            # Stable 0-10 jitter to break ties; crc32 (unlike hash()) is the same across runs
+            relevance_score += zlib.crc32(article['link'].encode()) % 11
             
             article['relevance_score'] = relevance_score
             
@@ -222,15 +484,11 @@ class MobileNewsAgent:
         """Filter for tech content"""
         self.update_status("🔧 Filtering tech content...")
         
-        tech_keywords = [
-            'ai', 'artificial intelligence', 'machine learning', 'technology', 
-            'software', 'computer', 'digital', 'tech', 'innovation', 'startup'
-        ]
-        
         tech_articles = []
         for article in self.articles:
-            content_text = (article['title'] + ' ' + article['summary'] + ' ' + article['content']).lower()
-            if any(keyword in content_text for keyword in tech_keywords):
+            if '_lc_all' not in article:  # Content extraction was skipped
+                self._cache_lowercase(article)
+            if _TECH_RE.search(article['_lc_all']):
                 tech_articles.append(article)
                 
         self.articles = tech_articles
@@ -299,8 +557,6 @@ class MobileNewsAgent:
                         results[step] = self.generate_summary_report()
                     elif step == "filter_tech_content":
                         results[step] = self.filter_tech_content()
-                        
-                    time.sleep(0.5)  # UI breathing room
                     
                 self.update_status("✅ Agent completed!")
                 
@@ -1,15 +1,85 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request
 import json
+import orjson
 from agent import NewsAgent
 import threading
 import time
+import queue
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 app = Flask(__name__)
 
-# Global agent instance
-agent = NewsAgent()
-current_task = None
-task_results = None
+def ojsonify(obj, status=200):
+    """jsonify() equivalent that encodes with orjson"""
+    return app.response_class(orjson.dumps(obj), status=status, mimetype='application/json')
+
+MAX_TASKS = 100  # Finished tasks kept around for status/results lookups
+MAX_PENDING_TASKS = 16  # Queued or running agent runs before new ones are refused
+
+# Agent runs execute here, so several clients can run the agent at once
+EXECUTOR = ThreadPoolExecutor(max_workers=4)
+TASKS = {}  # task_id -> Task
+TASKS_LOCK = threading.Lock()
+
+class Task:
+    """A single agent run with its own agent instance and event subscribers"""
+    
+    def __init__(self, query):
+        self.id = uuid.uuid4().hex
+        self.query = query
+        self.agent = NewsAgent(callback=lambda message: self.publish({'status': 'running', 'progress': message}))
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.encoded_status = None  # Cached /api/status body once completed
+        self.future = EXECUTOR.submit(self.run)
+        # Done-callbacks fire after the future is marked done, so a client
+        # subscribing concurrently either gets this event or a completed snapshot
+        self.future.add_done_callback(
+            lambda future: self.publish({'status': 'completed', 'results': future.result()})
+        )
+        
+    def run(self):
+        try:
+            print(f"Starting agent with query: {self.query}")
+            results = self.agent.run(self.query)
+            print(f"Agent completed. Results keys: {list(results.keys()) if results else 'None'}")
+        except Exception as e:
+            print(f"Agent error: {e}")
+            results = {'error': str(e)}
+        finally:
+            # The finished task only needs its results; release the pooled connections
+            self.agent.session.close()
+            self.agent = None
+        return results
+        
+    def publish(self, payload):
+        """Push a status payload to every connected /api/events client"""
+        with self.lock:
+            for subscriber in self.subscribers:
+                subscriber.put(payload)
+                
+    def subscribe(self):
+        subscriber = queue.Queue()
+        with self.lock:
+            self.subscribers.append(subscriber)
+        return subscriber
+        
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.remove(subscriber)
+            
+    def status_body(self):
+        """Encoded status payload; the completed one is encoded only once"""
+        if not self.future.done():
+            return orjson.dumps({'status': 'running', 'progress': 'Agent is working...'})
+        if self.encoded_status is None:
+            self.encoded_status = orjson.dumps({'status': 'completed', 'results': self.future.result()})
+        return self.encoded_status
+
+def get_task(task_id):
+    with TASKS_LOCK:
+        return TASKS.get(task_id)
 
 @app.route('/')
 def index():
@@ -17,53 +87,69 @@ def index():
 
 @app.route('/api/run_agent', methods=['POST'])
 def run_agent():
-    global current_task, task_results
-    
     data = request.get_json()
     query = data.get('query', 'Get me the latest news and summarize it')
     
-    # Check if agent is already running
-    if current_task and current_task.is_alive():
-        return jsonify({'error': 'Agent is already running'}), 400
+    with TASKS_LOCK:
+        if sum(not t.future.done() for t in TASKS.values()) >= MAX_PENDING_TASKS:
+            return ojsonify({'error': 'Too many agent runs in progress'}, 429)
+        task = Task(query)
+        TASKS[task.id] = task
+        # Forget the oldest finished tasks once we hold too many
+        for task_id in [tid for tid, t in TASKS.items() if t.future.done()][:max(0, len(TASKS) - MAX_TASKS)]:
+            del TASKS[task_id]
     
-    # Reset previous results
-    task_results = None
-    
-    # Start agent in background thread
-    def run_agent_task():
-        global task_results
-        try:
-            print(f"Starting agent with query: {query}")
-            task_results = agent.run(query)
-            print(f"Agent completed. Results keys: {list(task_results.keys()) if task_results else 'None'}")
-        except Exception as e:
-            print(f"Agent error: {e}")
-            task_results = {'error': str(e)}
+    return ojsonify({'message': 'Agent started', 'query': query, 'task_id': task.id})
+
+@app.route('/api/status/<task_id>')
+def get_status(task_id):
+    task = get_task(task_id)
+    if task is None:
+        return ojsonify({'error': 'Unknown task'}, 404)
+    return app.response_class(task.status_body(), mimetype='application/json')
+
+@app.route('/api/events/<task_id>')
+def events(task_id):
+    """Server-Sent Events stream of a task's status, pushed as it changes"""
+    task = get_task(task_id)
+    if task is None:
+        return ojsonify({'error': 'Unknown task'}, 404)
     
-    current_task = threading.Thread(target=run_agent_task)
-    current_task.start()
+    subscriber = task.subscribe()
+    # Start every stream with the current state
+    finished = task.future.done()
+    snapshot = task.status_body()
     
-    return jsonify({'message': 'Agent started', 'query': query})
-
-@app.route('/api/status')
-def get_status():
-    global current_task, task_results
+    def stream():
+        try:
+            yield b'data: ' + snapshot + b'\n\n'
+            # Nothing follows 'completed', so end the stream instead of holding a thread on keep-alives
+            if finished:
+                return
+            while True:
+                try:
+                    payload = subscriber.get(timeout=15)
+                except queue.Empty:
+                    # Keep-alive comment; also lets us notice disconnected clients
+                    yield b': keep-alive\n\n'
+                    continue
+                yield b'data: ' + orjson.dumps(payload) + b'\n\n'
+                if payload['status'] == 'completed':
+                    return
+        finally:
+            task.unsubscribe(subscriber)
     
-    if current_task and current_task.is_alive():
-        return jsonify({'status': 'running', 'progress': 'Agent is working...'})
-    elif task_results:
-        return jsonify({'status': 'completed', 'results': task_results})
-    else:
-        return jsonify({'status': 'idle'})
+    return app.response_class(stream(), mimetype='text/event-stream',
+                              headers={'Cache-Control': 'no-cache'})
 
-@app.route('/api/results')
-def get_results():
-    global task_results
+@app.route('/api/results/<task_id>')
+def get_results(task_id):
+    task = get_task(task_id)
     
-    if task_results:
-        return jsonify(task_results)
+    if task and task.future.done():
+        return ojsonify(task.future.result())
     else:
-        return jsonify({'error': 'No results available'}), 404
+        return ojsonify({'error': 'No results available'}, 404)
 
 if __name__ == '__main__':
     print("Starting News Agent Web Interface...")